@@ -1,8 +1,7 @@
 import streamlit as st
-import pandas as pd
 import numpy as np
-import pickle
-from datetime import datetime
+import os
+import threading
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -15,7 +14,7 @@ st.set_page_config(
 )
 
 # Custom CSS for better styling
-st.markdown("""
+CSS = """
 <style>
     .main-header {
         font-size: 2.5rem;
@@ -47,16 +46,358 @@ st.markdown("""
         border-radius: 5px;
         margin: 1rem 0;
     }
+    .score-grid {
+        display: flex;
+        gap: 1rem;
+        margin: 1rem 0;
+    }
+    .score {
+        flex: 1;
+    }
+    .score-label {
+        font-size: 0.9rem;
+        color: #555;
+    }
+    .score-value {
+        font-size: 2rem;
+    }
+    .risk-bar {
+        background-color: #f0f2f6;
+        border-radius: 5px;
+        height: 0.6rem;
+        margin: 0.5rem 0 1rem 0;
+    }
+    .risk-bar-fill {
+        background-color: #ff4b4b;
+        border-radius: 5px;
+        height: 100%;
+    }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+st.markdown(CSS, unsafe_allow_html=True)
+
+# Options offered for every categorical input, keyed by model feature name.
+# The first option of each list is the widget default.
+CATEGORY_OPTIONS = {
+    'Month': ['Dec', 'Jan', 'Oct', 'Jun', 'Feb', 'Nov', 'Apr', 'Mar', 'Aug', 'Jul', 'May', 'Sep'],
+    'DayOfWeek': ['Wednesday', 'Friday', 'Saturday', 'Monday', 'Tuesday', 'Sunday', 'Thursday'],
+    'Make': ['Honda', 'Toyota', 'Ford', 'Mazda', 'Chevrolet', 'Pontiac', 'Accura', 'Dodge',
+        'Mercury', 'Jaguar', 'Nisson', 'VW', 'Saab', 'Saturn', 'Porche', 'BMW', 'Mercedes',
+        'Ferrari', 'Lexus'],
+    'AccidentArea': ['Urban', 'Rural'],
+    'DayOfWeekClaimed': ['Tuesday', 'Monday', 'Thursday', 'Friday', 'Wednesday', 'Saturday',
+        'Sunday', '0'],
+    'MonthClaimed': ['Jan', 'Nov', 'Jul', 'Feb', 'Mar', 'Dec', 'Apr', 'Aug', 'May', 'Jun', 'Sep',
+        'Oct', '0'],
+    'Sex': ['Female', 'Male'],
+    'MaritalStatus': ['Single', 'Married', 'Widow', 'Divorced'],
+    'Fault': ['Policy Holder', 'Third Party'],
+    'PolicyType': ['Sport - Liability', 'Sport - Collision', 'Sedan - Liability',
+        'Utility - All Perils', 'Sedan - All Perils', 'Sedan - Collision', 'Utility - Collision',
+        'Utility - Liability', 'Sport - All Perils'],
+    'VehicleCategory': ['Sport', 'Utility', 'Sedan'],
+    'VehiclePrice': ['more than 69000', '20000 to 29000', '30000 to 39000', 'less than 20000',
+        '40000 to 59000', '60000 to 69000'],
+    'Days_Policy_Accident': ['more than 30', '15 to 30', 'none', '1 to 7', '8 to 15'],
+    'Days_Policy_Claim': ['more than 30', '15 to 30', '8 to 15', 'none'],
+    'PastNumberOfClaims': ['none', '1', '2 to 4', 'more than 4'],
+    'AgeOfVehicle': ['3 years', '6 years', '7 years', 'more than 7', '5 years', 'new', '4 years',
+        '2 years'],
+    'AgeOfPolicyHolder': ['26 to 30', '31 to 35', '41 to 50', '51 to 65', '21 to 25', '36 to 40',
+        '16 to 17', 'over 65', '18 to 20'],
+    'PoliceReportFiled': ['No', 'Yes'],
+    'WitnessPresent': ['No', 'Yes'],
+    'AgentType': ['External', 'Internal'],
+    'NumberOfSuppliments': ['none', 'more than 5', '3 to 5', '1 to 2'],
+    'AddressChange_Claim': ['1 year', 'no change', '4 to 8 years', '2 to 3 years',
+        'under 6 months'],
+    'NumberOfCars': ['3 to 4', '1 vehicle', '2 vehicles', '5 to 8', 'more than 8'],
+    'BasePolicy': ['Liability', 'Collision', 'All Perils'],
+}
+
+# Defaults for the numeric inputs (sliders and number inputs)
+NUMERIC_DEFAULTS = {
+    'WeekOfMonth': 3,
+    'WeekOfMonthClaimed': 3,
+    'Age': 40,
+    'PolicyNumber': 7710,
+    'RepNumber': 8,
+    'Deductible': 400,
+    'DriverRating': 2,
+    'Year': 1995,
+}
+
+# (min, max) allowed by each numeric widget
+NUMERIC_RANGES = {
+    'WeekOfMonth': (1, 5),
+    'WeekOfMonthClaimed': (0, 5),
+    'Age': (16, 80),
+    'PolicyNumber': (1, 15420),
+    'RepNumber': (1, 16),
+    'Deductible': (300, 700),
+    'DriverRating': (1, 4),
+    'Year': (1994, 1996),
+}
+
+# Column order of the feature dict returned by create_input_features
+FEATURE_COLUMNS = [
+    'Month',
+    'DayOfWeek',
+    'Make',
+    'AccidentArea',
+    'DayOfWeekClaimed',
+    'MonthClaimed',
+    'WeekOfMonth',
+    'WeekOfMonthClaimed',
+    'Sex',
+    'MaritalStatus',
+    'Age',
+    'Fault',
+    'PolicyType',
+    'VehicleCategory',
+    'VehiclePrice',
+    'Days_Policy_Accident',
+    'Days_Policy_Claim',
+    'PastNumberOfClaims',
+    'AgeOfVehicle',
+    'AgeOfPolicyHolder',
+    'PoliceReportFiled',
+    'WitnessPresent',
+    'AgentType',
+    'NumberOfSuppliments',
+    'AddressChange_Claim',
+    'NumberOfCars',
+    'BasePolicy',
+    'PolicyNumber',
+    'RepNumber',
+    'Deductible',
+    'DriverRating',
+    'Year',
+]
+
+# Label -> row index into each categorical feature's encoding table
+ENCODINGS = {
+    feature: {label: code for code, label in enumerate(options)}
+    for feature, options in CATEGORY_OPTIONS.items()
+}
+
+# Fraud probability cut-offs between the low, medium and high risk levels
+RISK_THRESHOLDS = np.array([0.4, 0.7])
+RISK_LABELS = np.array(["🟢 LOW RISK", "🟡 MEDIUM RISK", "🔴 HIGH RISK"])
+RISK_RECOMMENDATIONS = np.array([
+    "Standard processing appropriate",
+    "Additional review suggested",
+    "Immediate investigation recommended",
+])
+
+def risk_level_index(fraud_proba):
+    """Map fraud probabilities to indices into RISK_LABELS/RISK_RECOMMENDATIONS"""
+    # side='right' so a probability exactly on a threshold moves up a level
+    return np.searchsorted(RISK_THRESHOLDS, fraud_proba, side='right')
+
+# Where Treelite-compiled copies of the model are cached, keyed by model hash
+COMPILED_MODEL_DIR = '.model_cache'
+
+# (treelite, tl2cgen) versions the compiled predictor is used with; see
+# requirements-treelite.txt
+TREELITE_VERSIONS = ('4.0.0', '1.0.0')
+
+def build_encoding_tables(preprocessor):
+    """Probe the fitted preprocessor once to build per-feature lookup tables.
+    
+    Every encoder in the pipeline maps one input column to its own block of
+    output columns, so a claim can be encoded by writing each feature's block
+    independently: a table row per label for categoricals, and the fitted
+    scaler's center/scale for each numeric output column.
+    """
+    import pandas as pd
+    
+    base = {feature: options[0] for feature, options in CATEGORY_OPTIONS.items()}
+    base.update(NUMERIC_DEFAULTS)
+    
+    probes = [base]
+    for feature, options in CATEGORY_OPTIONS.items():
+        probes.extend({**base, feature: label} for label in options)
+    
+    encoded = np.asarray(
+        preprocessor.transform(pd.DataFrame(probes, columns=FEATURE_COLUMNS)), dtype=np.float64
+    )
+    
+    tables = {'base': encoded[0].astype(np.float32), 'categorical': {}, 'numeric': {}}
+    start = 1
+    for feature, options in CATEGORY_OPTIONS.items():
+        block = encoded[start:start + len(options)]
+        start += len(options)
+        columns = np.flatnonzero(np.ptp(block, axis=0))
+        tables['categorical'][feature] = (columns, block[:, columns].astype(np.float32))
+    
+    # Numerics are scaled with the fitted scaler's own parameters, applied in the
+    # same float64 order of operations, so split thresholds see identical values
+    column_transformer = preprocessor[-1]
+    for name, transformer, columns in column_transformer.transformers_:
+        if not hasattr(transformer, 'center_'):
+            continue
+        start = column_transformer.output_indices_[name].start
+        for i, feature in enumerate(columns):
+            tables['numeric'][feature] = (start + i, transformer.center_[i], transformer.scale_[i])
+    
+    missing = [feature for feature in NUMERIC_DEFAULTS if feature not in tables['numeric']]
+    if missing:
+        raise ValueError(f"No fitted scaler found for: {', '.join(missing)}")
+    
+    return tables
+
+def validate_encoding_tables(preprocessor, tables):
+    """Check the lookup tables reproduce the fitted preprocessor's output exactly.
+    
+    The check frame cycles through every widget option and every value in each
+    numeric widget's range. The whole frame is checked through encode_batch,
+    and a short sample covering every option through encode_row. Tree splits
+    need bit-identical float32 inputs, so encodings must match exactly.
+    
+    Returns the encoded check matrix so predictors can be compared on it.
+    """
+    import pandas as pd
+    
+    values = {feature: options for feature, options in CATEGORY_OPTIONS.items()}
+    values.update({feature: range(low, high + 1) for feature, (low, high) in NUMERIC_RANGES.items()})
+    n_rows = max(len(feature_values) for feature_values in values.values())
+    check = pd.DataFrame({feature: np.resize(list(values[feature]), n_rows) for feature in FEATURE_COLUMNS})
+    
+    expected = np.asarray(preprocessor.transform(check), dtype=np.float64).astype(np.float32)
+    if not np.array_equal(encode_batch(check, tables), expected):
+        raise ValueError("Batch encoding does not match the fitted preprocessor")
+    
+    # Columns cycle from the first row, so this many rows include every option
+    n_sample = max(len(options) for options in CATEGORY_OPTIONS.values())
+    row = tables['base'].reshape(1, -1).copy()
+    for i, features in enumerate(check.head(n_sample).to_dict('records')):
+        encode_row(features, row, tables)
+        if not np.array_equal(row[0], expected[i]):
+            raise ValueError(f"Encoding lookup tables do not match the fitted preprocessor for {features}")
+    
+    return expected
+
+def encode_row(features, row, tables):
+    """Encode one claim in place into a (1, n_features) float32 row"""
+    out = row[0]
+    for feature in FEATURE_COLUMNS:
+        value = features[feature]
+        if feature in ENCODINGS:
+            columns, values = tables['categorical'][feature]
+            out[columns] = values[ENCODINGS[feature][value]]
+        else:
+            column, center, scale = tables['numeric'][feature]
+            out[column] = (float(value) - center) / scale
+
+def encode_batch(df, tables):
+    """Encode a DataFrame of claims into an (n, n_features) float32 matrix"""
+    import pandas as pd
+    
+    rows = np.tile(tables['base'], (len(df), 1))
+    for feature in FEATURE_COLUMNS:
+        if feature in ENCODINGS:
+            columns, values = tables['categorical'][feature]
+            # Categorical codes follow the option order, i.e. the ENCODINGS codes
+            codes = pd.Categorical(df[feature], categories=list(ENCODINGS[feature])).codes
+            if (codes < 0).any():
+                unknown = df[feature][codes < 0].iloc[0]
+                raise ValueError(f"Unknown value '{unknown}' in column '{feature}'")
+            rows[:, columns] = values.take(codes, axis=0)
+        else:
+            column, center, scale = tables['numeric'][feature]
+            rows[:, column] = (df[feature].to_numpy(np.float64) - center) / scale
+    return rows
+
+def load_compiled_predictor(booster):
+    """Compile the booster into a shared library with Treelite/TL2cgen.
+    
+    Both packages are optional and only the pinned TREELITE_VERSIONS pair is
+    used. Returns a function mapping a float32 feature matrix to fraud
+    probabilities, or None when they are not available or the model cannot be
+    compiled on this machine.
+    """
+    try:
+        import treelite
+        import tl2cgen
+    except ImportError:
+        return None
+    if (treelite.__version__, tl2cgen.__version__) != TREELITE_VERSIONS:
+        return None
+    import hashlib
+    
+    tmp_libpath = None
+    try:
+        digest = hashlib.sha256(booster.save_raw()).hexdigest()[:16]
+        libpath = os.path.abspath(os.path.join(COMPILED_MODEL_DIR, f'fraud_model_{digest}.so'))
+        if not os.path.exists(libpath):
+            # Build under a per-builder name so concurrent workers never load a partial file
+            os.makedirs(COMPILED_MODEL_DIR, exist_ok=True)
+            tmp_libpath = f'{libpath[:-3]}.{os.getpid()}.{threading.get_ident()}.so'
+            tl2cgen.export_lib(treelite.frontend.from_xgboost(booster), toolchain='gcc', libpath=tmp_libpath)
+            os.replace(tmp_libpath, libpath)
+        predictor = tl2cgen.Predictor(libpath)
+    except Exception:
+        if tmp_libpath is not None and os.path.exists(tmp_libpath):
+            os.remove(tmp_libpath)
+        return None
+    
+    def predict(rows):
+        return predictor.predict(tl2cgen.DMatrix(rows)).reshape(-1)
+    
+    return predict
+
+def swap_in_compiled_predictor(loaded, booster, check_rows):
+    """Switch loaded['predict'] to the compiled model if it agrees on every check row"""
+    compiled = load_compiled_predictor(booster)
+    if compiled is None:
+        return
+    
+    # Fraud/no-fraud decisions must match exactly; probabilities to display precision
+    reference = booster.inplace_predict(check_rows)
+    candidate = compiled(check_rows)
+    if np.array_equal(candidate > 0.5, reference > 0.5) and np.allclose(candidate, reference, atol=1e-5):
+        loaded['predict'] = compiled
 
+# Streamlit re-executes this script in a fresh module on every rerun, so a
+# module-level global would not survive between runs; st.cache_resource is
+# what keeps a single loaded model per process.
 @st.cache_resource
 def load_model():
     """Load the trained XGBoost model pipeline"""
+    import pickle
+    
     try:
         with open('insurance_fraud_model.sav', 'rb') as file:
             model = pickle.load(file)
-        return model
+        
+        # Split the pipeline once so predictions can bypass the sklearn wrapper
+        preprocessor = model[:-1]
+        booster = model[-1].get_booster()
+        tables = build_encoding_tables(preprocessor)
+        check_rows = validate_encoding_tables(preprocessor, tables)
+        
+        # The base row holds the widget defaults; scoring it once warms up the
+        # booster so the first real submission doesn't pay the setup cost
+        row = tables['base'].reshape(1, -1).copy()
+        booster.inplace_predict(row)
+        
+        loaded = {
+            'pipeline': model,
+            'predict': booster.inplace_predict,
+            'tables': tables,
+            'row': row,
+            'row_lock': threading.Lock(),
+        }
+        
+        # Compiling takes seconds, so it runs off the request path and the
+        # compiled predictor is only swapped in once it has been checked
+        threading.Thread(
+            target=swap_in_compiled_predictor, args=(loaded, booster, check_rows), daemon=True
+        ).start()
+        
+        return loaded
     except FileNotFoundError:
         st.error("Model file 'insurance_fraud_model.sav' not found. Please ensure the file is in the same directory as this app.")
         return None
@@ -64,104 +405,91 @@ def load_model():
         st.error(f"Error loading model: {str(e)}")
         return None
 
+def vehicle_category_of(policy_type):
+    """Return the vehicle category encoded in a policy type label"""
+    return policy_type.split(" - ")[0]
+
 def create_input_features():
-    """Create input widgets for all features"""
+    """Create input widgets for all features inside a single form.
     
-    st.markdown('<h1 class="main-header">🔍 Insurance Fraud Detection System</h1>', unsafe_allow_html=True)
+    Returns the feature dict and whether the form was submitted on this run.
+    """
     
-    col1, col2, col3 = st.columns(3)
+    with st.form("fraud_form", clear_on_submit=False):
+        col1, col2, col3 = st.columns(3)
+        
+        with col1:
+            st.subheader("📅 Temporal Information")
+            month = st.selectbox("Month", CATEGORY_OPTIONS['Month'], key='Month')
+            
+            day_of_week = st.selectbox("Day of Week", CATEGORY_OPTIONS['DayOfWeek'], key='DayOfWeek')
+            
+            week_of_month = st.slider("Week of Month", *NUMERIC_RANGES['WeekOfMonth'], NUMERIC_DEFAULTS['WeekOfMonth'], key='WeekOfMonth')
+            week_of_month_claimed = st.slider("Week of Month (Claimed)", *NUMERIC_RANGES['WeekOfMonthClaimed'], NUMERIC_DEFAULTS['WeekOfMonthClaimed'], key='WeekOfMonthClaimed')
+            
+            month_claimed = st.selectbox("Month Claimed", CATEGORY_OPTIONS['MonthClaimed'], key='MonthClaimed')
+            
+            day_of_week_claimed = st.selectbox("Day of Week (Claimed)", CATEGORY_OPTIONS['DayOfWeekClaimed'], key='DayOfWeekClaimed')
+            
+        with col2:
+            st.subheader("🚗 Vehicle & Policy Information")
+            make = st.selectbox("Vehicle Make", CATEGORY_OPTIONS['Make'], key='Make')
+            
+            vehicle_price = st.selectbox("Vehicle Price Range", CATEGORY_OPTIONS['VehiclePrice'], key='VehiclePrice')
+            
+            age_of_vehicle = st.selectbox("Age of Vehicle", CATEGORY_OPTIONS['AgeOfVehicle'], key='AgeOfVehicle')
+            
+            policy_type = st.selectbox("Policy Type", CATEGORY_OPTIONS['PolicyType'], key='PolicyType')
+            # Vehicle category is implied by the policy type, e.g. 'Sport - Liability'
+            vehicle_category = vehicle_category_of(policy_type)
+            
+            base_policy = st.selectbox("Base Policy", CATEGORY_OPTIONS['BasePolicy'], key='BasePolicy')
+            
+            deductible = st.slider("Deductible", *NUMERIC_RANGES['Deductible'], NUMERIC_DEFAULTS['Deductible'], step=100, key='Deductible')
+            
+        with col3:
+            st.subheader("👤 Personal Information")
+            sex = st.radio("Sex", CATEGORY_OPTIONS['Sex'], horizontal=True, key='Sex')
+            
+            marital_status = st.selectbox("Marital Status", CATEGORY_OPTIONS['MaritalStatus'], key='MaritalStatus')
+            
+            age = st.slider("Age", *NUMERIC_RANGES['Age'], NUMERIC_DEFAULTS['Age'], key='Age')
+            
+            age_of_policy_holder = st.selectbox("Age Group of Policy Holder", CATEGORY_OPTIONS['AgeOfPolicyHolder'], key='AgeOfPolicyHolder')
+            
+            fault = st.radio("At Fault", CATEGORY_OPTIONS['Fault'], horizontal=True, key='Fault')
+            
+            accident_area = st.radio("Accident Area", CATEGORY_OPTIONS['AccidentArea'], horizontal=True, key='AccidentArea')
+            
+            driver_rating = st.slider("Driver Rating", *NUMERIC_RANGES['DriverRating'], NUMERIC_DEFAULTS['DriverRating'], key='DriverRating')
+            
+            # Additional features in a separate section
+            st.subheader("📊 Additional Details")
+            
+            policy_number = st.number_input("Policy Number", min_value=NUMERIC_RANGES['PolicyNumber'][0], max_value=NUMERIC_RANGES['PolicyNumber'][1], value=NUMERIC_DEFAULTS['PolicyNumber'], key='PolicyNumber')
+            rep_number = st.slider("Rep Number", *NUMERIC_RANGES['RepNumber'], NUMERIC_DEFAULTS['RepNumber'], key='RepNumber')
+            
+            year = st.slider("Year", *NUMERIC_RANGES['Year'], NUMERIC_DEFAULTS['Year'], key='Year')
+            
+            days_policy_accident = st.selectbox("Days Policy to Accident", CATEGORY_OPTIONS['Days_Policy_Accident'], key='Days_Policy_Accident')
+            
+            days_policy_claim = st.selectbox("Days Policy to Claim", CATEGORY_OPTIONS['Days_Policy_Claim'], key='Days_Policy_Claim')
+            
+            past_number_of_claims = st.selectbox("Past Number of Claims", CATEGORY_OPTIONS['PastNumberOfClaims'], key='PastNumberOfClaims')
+            
+            police_report_filed = st.radio("Police Report Filed", CATEGORY_OPTIONS['PoliceReportFiled'], horizontal=True, key='PoliceReportFiled')
+            witness_present = st.radio("Witness Present", CATEGORY_OPTIONS['WitnessPresent'], horizontal=True, key='WitnessPresent')
+            agent_type = st.radio("Agent Type", CATEGORY_OPTIONS['AgentType'], horizontal=True, key='AgentType')
+            
+            number_of_suppliments = st.selectbox("Number of Suppliments", CATEGORY_OPTIONS['NumberOfSuppliments'], key='NumberOfSuppliments')
+            
+            address_change_claim = st.selectbox("Address Change Claim", CATEGORY_OPTIONS['AddressChange_Claim'], key='AddressChange_Claim')
+            
+            number_of_cars = st.selectbox("Number of Cars", CATEGORY_OPTIONS['NumberOfCars'], key='NumberOfCars')
+            
+        submitted = st.form_submit_button("🔍 Predict Fraud Risk", type="primary", use_container_width=True)
     
-    with col1:
-        st.subheader("📅 Temporal Information")
-        month = st.selectbox("Month", 
-                            ['Dec', 'Jan', 'Oct', 'Jun', 'Feb', 'Nov', 'Apr', 'Mar', 'Aug', 'Jul', 'May', 'Sep'])
-        
-        day_of_week = st.selectbox("Day of Week", 
-                                  ['Wednesday', 'Friday', 'Saturday', 'Monday', 'Tuesday', 'Sunday', 'Thursday'])
-        
-        week_of_month = st.slider("Week of Month", 1, 5, 3)
-        week_of_month_claimed = st.slider("Week of Month (Claimed)", 0, 5, 3)
-        
-        month_claimed = st.selectbox("Month Claimed", 
-                                    ['Jan', 'Nov', 'Jul', 'Feb', 'Mar', 'Dec', 'Apr', 'Aug', 'May', 'Jun', 'Sep', 'Oct', '0'])
-        
-        day_of_week_claimed = st.selectbox("Day of Week (Claimed)", 
-                                          ['Tuesday', 'Monday', 'Thursday', 'Friday', 'Wednesday', 'Saturday', 'Sunday', '0'])
-        
-    with col2:
-        st.subheader("🚗 Vehicle & Policy Information")
-        make = st.selectbox("Vehicle Make", 
-                           ['Honda', 'Toyota', 'Ford', 'Mazda', 'Chevrolet', 'Pontiac', 'Accura', 'Dodge', 
-                            'Mercury', 'Jaguar', 'Nisson', 'VW', 'Saab', 'Saturn', 'Porche', 'BMW', 
-                            'Mercedes', 'Ferrari', 'Lexus'])
-        
-        vehicle_category = st.selectbox("Vehicle Category", ['Sport', 'Utility', 'Sedan'])
-        
-        vehicle_price = st.selectbox("Vehicle Price Range",
-                                    ['more than 69000', '20000 to 29000', '30000 to 39000', 'less than 20000',
-                                     '40000 to 59000', '60000 to 69000'])
-        
-        age_of_vehicle = st.selectbox("Age of Vehicle",
-                                     ['3 years', '6 years', '7 years', 'more than 7', '5 years', 'new', '4 years', '2 years'])
-        
-        policy_type = st.selectbox("Policy Type",
-                                  ['Sport - Liability', 'Sport - Collision', 'Sedan - Liability', 'Utility - All Perils',
-                                   'Sedan - All Perils', 'Sedan - Collision', 'Utility - Collision', 'Utility - Liability',
-                                   'Sport - All Perils'])
-        
-        base_policy = st.selectbox("Base Policy", ['Liability', 'Collision', 'All Perils'])
-        
-        deductible = st.slider("Deductible", 300, 700, 400, step=100)
-        
-    with col3:
-        st.subheader("👤 Personal Information")
-        sex = st.selectbox("Sex", ['Female', 'Male'])
-        
-        marital_status = st.selectbox("Marital Status", ['Single', 'Married', 'Widow', 'Divorced'])
-        
-        age = st.slider("Age", 16, 80, 40)
-        
-        age_of_policy_holder = st.selectbox("Age Group of Policy Holder",
-                                           ['26 to 30', '31 to 35', '41 to 50', '51 to 65', '21 to 25',
-                                            '36 to 40', '16 to 17', 'over 65', '18 to 20'])
-        
-        fault = st.selectbox("At Fault", ['Policy Holder', 'Third Party'])
-        
-        accident_area = st.selectbox("Accident Area", ['Urban', 'Rural'])
-        
-        driver_rating = st.slider("Driver Rating", 1, 4, 2)
-        
-        # Additional features in a separate section
-        st.subheader("📊 Additional Details")
-        
-        policy_number = st.number_input("Policy Number", min_value=1, max_value=15420, value=7710)
-        rep_number = st.slider("Rep Number", 1, 16, 8)
-        
-        year = st.slider("Year", 1994, 1996, 1995)
-        
-        days_policy_accident = st.selectbox("Days Policy to Accident",
-                                           ['more than 30', '15 to 30', 'none', '1 to 7', '8 to 15'])
-        
-        days_policy_claim = st.selectbox("Days Policy to Claim",
-                                        ['more than 30', '15 to 30', '8 to 15', 'none'])
-        
-        past_number_of_claims = st.selectbox("Past Number of Claims",
-                                            ['none', '1', '2 to 4', 'more than 4'])
-        
-        police_report_filed = st.selectbox("Police Report Filed", ['No', 'Yes'])
-        witness_present = st.selectbox("Witness Present", ['No', 'Yes'])
-        agent_type = st.selectbox("Agent Type", ['External', 'Internal'])
-        
-        number_of_suppliments = st.selectbox("Number of Suppliments",
-                                            ['none', 'more than 5', '3 to 5', '1 to 2'])
-        
-        address_change_claim = st.selectbox("Address Change Claim",
-                                           ['1 year', 'no change', '4 to 8 years', '2 to 3 years', 'under 6 months'])
-        
-        number_of_cars = st.selectbox("Number of Cars",
-                                     ['3 to 4', '1 vehicle', '2 vehicles', '5 to 8', 'more than 8'])
-        
-    return {
+    features = {
         'Month': month,
         'DayOfWeek': day_of_week,
         'Make': make,
@@ -195,22 +523,141 @@ def create_input_features():
         'DriverRating': driver_rating,
         'Year': year
     }
+    return features, submitted
+
+@st.cache_data(show_spinner=False, max_entries=256)
+def _cached_predict(features_tuple):
+    """Score a single claim, cached on the tuple of (feature, value) pairs"""
+    model = load_model()
+    row = model['row']
+    
+    # Encode into the shared row buffer via the precomputed lookup tables
+    features = dict(features_tuple)
+    with model['row_lock']:
+        encode_row(features, row, model['tables'])
+        fraud_proba = float(model['predict'](row)[0])
+    
+    # binary:logistic returns P(fraud); XGBClassifier.predict thresholds at 0.5
+    prediction = int(fraud_proba > 0.5)
+    return prediction, (1.0 - fraud_proba, fraud_proba)
 
-def make_prediction(model, features):
+def make_prediction(features):
     """Make fraud prediction using the trained model"""
     try:
-        # Convert features to DataFrame
-        df = pd.DataFrame([features])
-        
-        # Make prediction
-        prediction = model.predict(df)[0]
-        prediction_proba = model.predict_proba(df)[0]
-        
-        return prediction, prediction_proba
+        return _cached_predict(tuple(features.items()))
     except Exception as e:
+        # Emitted on every failing run: Streamlit drops any element a rerun does not re-emit
         st.error(f"Error making prediction: {str(e)}")
         return None, None
 
+def build_result_html(prediction, prediction_proba):
+    """Render the full prediction result as a single HTML block"""
+    if prediction == 1:
+        box = """<div class="prediction-box fraud-detected">
+⚠️ FRAUD DETECTED ⚠️<br>
+This claim shows high risk indicators
+</div>"""
+    else:
+        box = """<div class="prediction-box no-fraud">
+✅ LOW FRAUD RISK<br>
+This claim appears legitimate
+</div>"""
+    
+    # Risk interpretation
+    fraud_prob = prediction_proba[1]
+    level = risk_level_index(fraud_prob)
+    risk_level = RISK_LABELS[level]
+    recommendation = RISK_RECOMMENDATIONS[level]
+    
+    return f"""{box}
+<h3>📊 Confidence Scores</h3>
+<div class="score-grid">
+<div class="score" title="Probability that this claim is legitimate">
+<div class="score-label">No Fraud Probability</div>
+<div class="score-value">{prediction_proba[0]:.3f}</div>
+</div>
+<div class="score" title="Probability that this claim is fraudulent">
+<div class="score-label">Fraud Probability</div>
+<div class="score-value">{prediction_proba[1]:.3f}</div>
+</div>
+</div>
+<h3>📈 Risk Assessment</h3>
+<div>Fraud Risk: {fraud_prob:.1%}</div>
+<div class="risk-bar"><div class="risk-bar-fill" style="width:{fraud_prob * 100:.1f}%"></div></div>
+<div><strong>Risk Level:</strong> {risk_level}<br>
+<strong>Recommendation:</strong> {recommendation}</div>"""
+
+@st.fragment
+def _prediction_fragment():
+    """Input form plus prediction output, rerun in isolation on submit"""
+    # Get input features
+    features, submitted = create_input_features()
+    
+    # Prediction section
+    st.markdown("---")
+    col1, col2, col3 = st.columns([1, 2, 1])
+    
+    with col2:
+        # Single slot whose contents are replaced, not appended, on each submit
+        result_slot = st.empty()
+        
+        if submitted:
+            with result_slot.container():
+                # Resubmitting an unchanged form reuses the previous result
+                features_hash = hash(tuple(features.items()))
+                if features_hash == st.session_state.get('last_hash'):
+                    prediction, prediction_proba = st.session_state['last_result']
+                else:
+                    with st.spinner("Analyzing claim data..."):
+                        prediction, prediction_proba = make_prediction(features)
+                    
+                    if prediction is not None:
+                        st.session_state['last_hash'] = features_hash
+                        st.session_state['last_result'] = (prediction, prediction_proba)
+                
+                if prediction is not None:
+                    st.markdown(build_result_html(prediction, prediction_proba), unsafe_allow_html=True)
+
+@st.fragment
+def _batch_fragment():
+    """Score an uploaded CSV of claims in a single predictor call"""
+    import pandas as pd
+    
+    st.markdown("Upload a CSV with one claim per row and a column for each model feature.")
+    uploaded = st.file_uploader("Batch CSV", type="csv")
+    if uploaded is None:
+        return
+    
+    try:
+        # Read categoricals as text so labels like '1' or '0' match the widget options
+        df = pd.read_csv(uploaded, dtype={feature: str for feature in CATEGORY_OPTIONS})
+        if 'VehicleCategory' not in df.columns and 'PolicyType' in df.columns:
+            df['VehicleCategory'] = df['PolicyType'].map(vehicle_category_of, na_action='ignore')
+        missing = [feature for feature in FEATURE_COLUMNS if feature not in df.columns]
+        if missing:
+            raise ValueError(f"Missing columns: {', '.join(missing)}")
+        
+        model = load_model()
+        fraud_proba = model['predict'](encode_batch(df, model['tables']))
+    except Exception as e:
+        st.error(f"Error scoring batch: {str(e)}")
+        return
+    
+    results = df.assign(
+        FraudProbability=fraud_proba,
+        Prediction=(fraud_proba > 0.5).astype(int),
+        RiskLevel=RISK_LABELS[risk_level_index(fraud_proba)],
+    )
+    
+    st.success(f"Scored {len(results)} claims, {int(results['Prediction'].sum())} flagged as fraud")
+    st.download_button(
+        "📥 Download Predictions",
+        results.to_csv(index=False),
+        file_name="fraud_predictions.csv",
+        mime="text/csv",
+        use_container_width=True,
+    )
+
 def main():
     # Load model
     model = load_model()
@@ -238,67 +685,16 @@ def main():
         4. Use results to guide investigation priorities
         """)
     
-    # Get input features
-    features = create_input_features()
+    st.markdown('<h1 class="main-header">🔍 Insurance Fraud Detection System</h1>', unsafe_allow_html=True)
     
-    # Prediction section
-    st.markdown("---")
-    col1, col2, col3 = st.columns([1, 2, 1])
+    single_tab, batch_tab = st.tabs(["🔍 Single Claim", "📂 Batch Scoring"])
     
-    with col2:
-        if st.button("🔍 Predict Fraud Risk", type="primary", use_container_width=True):
-            with st.spinner("Analyzing claim data..."):
-                prediction, prediction_proba = make_prediction(model, features)
-                
-                if prediction is not None:
-                    # Display prediction
-                    if prediction == 1:
-                        st.markdown("""
-                        <div class="prediction-box fraud-detected">
-                            ⚠️ FRAUD DETECTED ⚠️<br>
-                            This claim shows high risk indicators
-                        </div>
-                        """, unsafe_allow_html=True)
-                    else:
-                        st.markdown("""
-                        <div class="prediction-box no-fraud">
-                            ✅ LOW FRAUD RISK<br>
-                            This claim appears legitimate
-                        </div>
-                        """, unsafe_allow_html=True)
-                    
-                    # Display confidence scores
-                    st.markdown("### 📊 Confidence Scores")
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        st.metric("No Fraud Probability", f"{prediction_proba[0]:.3f}", 
-                                 help="Probability that this claim is legitimate")
-                    
-                    with col2:
-                        st.metric("Fraud Probability", f"{prediction_proba[1]:.3f}",
-                                 help="Probability that this claim is fraudulent")
-                    
-                    # Progress bars for visual representation
-                    st.markdown("### 📈 Risk Assessment")
-                    st.progress(float(prediction_proba[1]), text=f"Fraud Risk: {prediction_proba[1]:.1%}")
-                    
-                    # Risk interpretation
-                    fraud_prob = prediction_proba[1]
-                    if fraud_prob >= 0.7:
-                        risk_level = "🔴 HIGH RISK"
-                        recommendation = "Immediate investigation recommended"
-                    elif fraud_prob >= 0.4:
-                        risk_level = "🟡 MEDIUM RISK"
-                        recommendation = "Additional review suggested"
-                    else:
-                        risk_level = "🟢 LOW RISK"
-                        recommendation = "Standard processing appropriate"
-                    
-                    st.markdown(f"""
-                    **Risk Level:** {risk_level}  
-                    **Recommendation:** {recommendation}
-                    """)
+    # Each tab reruns on its own when its input is submitted or uploaded
+    with single_tab:
+        _prediction_fragment()
+    
+    with batch_tab:
+        _batch_fragment()
     
     # Add footer with educational information
     st.markdown("---")